@@ -1,6 +1,7 @@
+import multiprocessing
+import os
 import random
 import time
-import copy
 import numpy as np
 
 # Constants
@@ -9,215 +10,524 @@ COLS = 12
 AI_PLAYER = 1  # AI
 HUMAN_PLAYER = -1  # Human
 EMPTY = 0
-MAX_DEPTH = 6  # Depth for Minimax (tune for 10-second limit)
+# Integer bounds for alpha-beta (cheaper to compare than float infinities)
+NEG_INF = -10**9
+POS_INF = 10**9
+MAX_TIME = 9  # Seconds per decision (leaving 1 sec for overhead)
+MAX_DEPTH_CAP = ROWS * COLS  # Iterative deepening never needs more plies than cells
+ASPIRATION_WINDOW = 50  # Half-width of the root window around the previous iteration's score
+NULL_MOVE_R = 2  # Depth reduction of the null-move search
+NULL_MOVE_MIN_DEPTH = 3  # Null-move pruning is only tried this far from the leaves
+MAX_EXTENSIONS = 4  # Plies a line may be extended past the horizon while it keeps making threats
+TT_MAX_SIZE = 1 << 20  # Entries kept in the transposition table before it is cleared
+ROOT_WORKERS = min(os.cpu_count() or 1, COLS)  # Processes searching root moves in parallel
+PARALLEL_MIN_DEPTH = 6  # Shallower iterations are too quick to be worth sending to the pool
+# Forked workers start with the parent's Zobrist keys and tables. Where fork is unavailable,
+# spawned workers re-import this module and build their own tables from scratch instead.
+POOL_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+
+# Bitboard layout: one integer per player, cell (row, col) is bit col*7 + (5-row).
+# Each column uses 7 bits (6 rows + 1 sentinel) so shifts never wrap between columns.
+# A board is the list [ai_bits, hu_bits, heights, zkey, zkey_mirror], updated in place,
+# where zkey_mirror is the Zobrist key of the column-reversed board.
+H1 = ROWS + 1
+
+# Columns sorted from the center outwards
+COL_ORDER = sorted(range(COLS), key=lambda c: abs(c - (COLS - 1) / 2))
+
+# Masks: bottom cell of each column, every playable cell, every cell of one column
+BOTTOM_MASK = sum(1 << (col * H1) for col in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+COLUMN_MASKS = [((1 << ROWS) - 1) << (col * H1) for col in range(COLS)]
+
+# Bit of each cell, indexed by row * COLS + col
+CELL_BITS = [1 << (col * H1 + (ROWS - 1 - row)) for row in range(ROWS) for col in range(COLS)]
+
+# Every 4-cell window of the four directions as cell indices into CELL_BITS
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (-1, 1))  # Horizontal, vertical, both diagonals
+WINDOWS = [tuple((row + i * dr) * COLS + col + i * dc for i in range(4))
+           for dr, dc in DIRECTIONS
+           for row in range(ROWS) for col in range(COLS)
+           if 0 <= row + 3 * dr < ROWS and col + 3 * dc < COLS]
+WINDOW_MASKS = [sum(CELL_BITS[i] for i in window) for window in WINDOWS]
+# Masks of the windows through each cell, indexed by row * COLS + col
+CELL_WINDOW_MASKS = [[mask for mask in WINDOW_MASKS if mask & bit] for bit in CELL_BITS]
+
+# Zobrist keys, indexed by [row][col][player index] (0 for AI, 1 for human)
+ZOB = [[[random.getrandbits(64) for _ in range(2)] for _ in range(COLS)] for _ in range(ROWS)]
+# Keys of the mirrored cell: a board and its left-right twin swap zkey and zkey_mirror
+ZOB_MIRROR = [[ZOB[row][COLS - 1 - col] for col in range(COLS)] for row in range(ROWS)]
+MIN_TURN_KEY = random.getrandbits(64)  # Distinguishes min nodes from max nodes
+
+# Transposition table: canonical key -> (depth, value, flag, best_move).
+# Mirror positions share one entry under min(zkey, zkey_mirror), best_move in that orientation.
+EXACT, LOWER, UPPER = 0, 1, 2
+TT = {}
+EVAL_CACHE = {}  # canonical key -> heuristic value (the heuristic is symmetric)
+
+# Move ordering learned from cutoffs: two killer moves per depth, history per [player index][col]
+KILLERS = [[None, None] for _ in range(MAX_DEPTH_CAP + 1)]
+HISTORY = [[0] * COLS, [0] * COLS]
+
+class SearchTimeout(Exception):
+    """Raised when the search runs past its deadline."""
+
+def create_board():
+    """Return an empty board."""
+    return [0, 0, [0] * COLS, 0, 0]
+
+def flat_cells(board):
+    """Return the content of every cell as a flat list indexed by row * COLS + col."""
+    ai_bits, hu_bits = board[0], board[1]
+    return [AI_PLAYER if ai_bits & bit else HUMAN_PLAYER if hu_bits & bit else EMPTY
+            for bit in CELL_BITS]
+
+def board_to_grid(board):
+    """Return the board as a list of rows (row 0 is the top)."""
+    cells = flat_cells(board)
+    return [cells[row * COLS:(row + 1) * COLS] for row in range(ROWS)]
 
 def is_valid_move(board, col):
     """Check if a move in the given column is valid."""
-    return 0 <= col < COLS and board[0][col] == EMPTY
+    return 0 <= col < COLS and board[2][col] < ROWS
 
 def get_valid_moves(board):
     """Return a list of valid column indices for moves."""
-    return [col for col in range(COLS) if is_valid_move(board, col)]
-
-def drop_piece(board, col, player):
-    """Drop a piece in the specified column for the given player."""
-    new_board = copy.deepcopy(board)
-    for row in range(ROWS - 1, -1, -1):
-        if new_board[row][col] == EMPTY:
-            new_board[row][col] = player
-            return new_board, row
-    return new_board, -1  # Should not reach here if move is valid
-
-def check_win(board, player):
-    """Check if the given player has won (four in a row)."""
+    heights = board[2]
+    return [col for col in range(COLS) if heights[col] < ROWS]
+
+def make_move(board, col, player):
+    """Drop a piece in the specified column for the given player and return its row."""
+    heights = board[2]
+    height = heights[col]
+    if height >= ROWS:
+        return -1  # Should not reach here if move is valid
+    row = ROWS - 1 - height
+    if player == AI_PLAYER:
+        board[0] |= 1 << (col * H1 + height)
+        board[3] ^= ZOB[row][col][0]
+        board[4] ^= ZOB_MIRROR[row][col][0]
+    else:
+        board[1] |= 1 << (col * H1 + height)
+        board[3] ^= ZOB[row][col][1]
+        board[4] ^= ZOB_MIRROR[row][col][1]
+    heights[col] = height + 1
+    return row
+
+def unmake_move(board, col, row):
+    """Remove the piece at (row, col) played by make_move."""
+    bit = 1 << (col * H1 + (ROWS - 1 - row))
+    if board[0] & bit:
+        board[0] ^= bit
+        board[3] ^= ZOB[row][col][0]
+        board[4] ^= ZOB_MIRROR[row][col][0]
+    else:
+        board[1] ^= bit
+        board[3] ^= ZOB[row][col][1]
+        board[4] ^= ZOB_MIRROR[row][col][1]
+    board[2][col] -= 1
+
+def check_win(bits):
+    """Check if the given bitboard contains four in a row."""
     # Horizontal
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            if all(board[row][col + i] == player for i in range(4)):
-                return True
-
+    m = bits & (bits >> H1)
+    if m & (m >> (2 * H1)):
+        return True
     # Vertical
-    for row in range(ROWS - 3):
-        for col in range(COLS):
-            if all(board[row + i][col] == player for i in range(4)):
-                return True
-
+    m = bits & (bits >> 1)
+    if m & (m >> 2):
+        return True
     # Diagonal (positive slope)
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if all(board[row + i][col + i] == player for i in range(4)):
-                return True
-
+    m = bits & (bits >> (H1 + 1))
+    if m & (m >> (2 * (H1 + 1))):
+        return True
     # Diagonal (negative slope)
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if all(board[row - i][col + i] == player for i in range(4)):
-                return True
+    m = bits & (bits >> (H1 - 1))
+    if m & (m >> (2 * (H1 - 1))):
+        return True
+    return False
 
+def winning_cells(bits, occupied):
+    """Return the bitboard of empty cells that would complete four in a row for bits."""
+    # Vertical
+    cells = (bits << 1) & (bits << 2) & (bits << 3)
+    # Horizontal and both diagonals: the new cell can be at any of the four positions
+    for shift in (H1, H1 - 1, H1 + 1):
+        pair = (bits << shift) & (bits << (2 * shift))
+        cells |= pair & (bits << (3 * shift))
+        cells |= pair & (bits >> shift)
+        pair = (bits >> shift) & (bits >> (2 * shift))
+        cells |= pair & (bits << shift)
+        cells |= pair & (bits >> (3 * shift))
+    return cells & (BOARD_MASK ^ occupied)
+
+def has_threat(board):
+    """Check if either player has an empty cell, playable or not, that would complete a four."""
+    ai_bits, hu_bits = board[0], board[1]
+    occupied = ai_bits | hu_bits
+    return bool(winning_cells(ai_bits, occupied) or winning_cells(hu_bits, occupied))
+
+def creates_three_threat(board, row, col, player):
+    """Check if the piece at (row, col) gives player three in a window whose fourth cell is playable now."""
+    if player == AI_PLAYER:
+        own, other = board[0], board[1]
+    else:
+        own, other = board[1], board[0]
+    playable = (own | other) + BOTTOM_MASK  # Lowest empty cell of each column
+    for mask in CELL_WINDOW_MASKS[row * COLS + col]:
+        if not other & mask and (own & mask).bit_count() == 3 and playable & mask & ~own:
+            return True
     return False
 
 def is_board_full(board):
     """Check if the board is full (draw)."""
-    return all(board[0][col] != EMPTY for col in range(COLS))
+    return (board[0] | board[1]) == BOARD_MASK
 
 def Terminal_Test(board):
     """Check if the game is over (win or draw)."""
-    return check_win(board, AI_PLAYER) or check_win(board, HUMAN_PLAYER) or is_board_full(board)
-
-def Utility(board):
-    """Return utility value for terminal state."""
-    if check_win(board, AI_PLAYER):
-        return 10000  # Increased to ensure win priority
-    if check_win(board, HUMAN_PLAYER):
-        return -10000
-    return 0  # Draw
-
-def check_immediate_threat(board, player, col):
-    """Check if placing a piece in col creates a four-in-a-row for player."""
-    temp_board, row = drop_piece(board, col, player)
-    if row == -1:  # Invalid move
-        return False
-    return check_win(temp_board, player)
-
-def prioritize_moves(board):
-    """Order moves to check winning moves first, then blocking moves, then center columns."""
-    valid_moves = get_valid_moves(board)
-    winning_moves = []
+    return check_win(board[0]) or check_win(board[1]) or is_board_full(board)
+
+def terminal_utility(board, last_player):
+    """Return (is_terminal, utility) right after last_player has moved.
+
+    Only the player who just moved can have completed a four, so only their bitboard is checked.
+    """
+    if last_player == AI_PLAYER:
+        if check_win(board[0]):
+            return True, 10000
+    elif check_win(board[1]):
+        return True, -10000
+    if (board[0] | board[1]) == BOARD_MASK:
+        return True, 0  # Draw
+    return False, 0
+
+def prioritize_moves(board, killers=(), history=None):
+    """Yield winning moves, blocking moves, killer moves, then the rest by history and center."""
+    ai_bits, hu_bits = board[0], board[1]
+    occupied = ai_bits | hu_bits
+    # Cells a piece can be dropped in, and which of them complete a four
+    playable = (occupied + BOTTOM_MASK) & BOARD_MASK
+    ai_wins = winning_cells(ai_bits, occupied) & playable
+    hu_wins = winning_cells(hu_bits, occupied) & playable
     blocking_moves = []
     other_moves = []
 
-    for col in valid_moves:
+    for col in COL_ORDER:
+        bit = playable & COLUMN_MASKS[col]
+        if not bit:
+            continue
         # Check if AI can win
-        if check_immediate_threat(board, AI_PLAYER, col):
-            winning_moves.append(col)
+        if ai_wins & bit:
+            yield col
         # Check if human can win (AI needs to block)
-        elif check_immediate_threat(board, HUMAN_PLAYER, col):
+        elif hu_wins & bit:
             blocking_moves.append(col)
         else:
             other_moves.append(col)
 
-    # Sort other moves by center preference
-    center_columns = [5, 6, 4, 7, 3, 8]
-    other_moves.sort(key=lambda x: center_columns.index(x) if x in center_columns else len(center_columns))
-
-    return winning_moves + blocking_moves + other_moves
+    yield from blocking_moves
+    for col in killers:
+        if col in other_moves:
+            other_moves.remove(col)
+            yield col
+    if history is not None:
+        other_moves.sort(key=history.__getitem__, reverse=True)  # Stable: ties keep center order
+    yield from other_moves
+
+SEQUENCE_WEIGHTS = (0, 1, 10, 100)  # Weights for sequences, indexed by length
+
+def count_sequence(line, player):
+    """Score the sequences of player in a 4-cell line."""
+    threat = 1000 if player == AI_PLAYER else -1000
+    count = 0
+    empty = 0
+    seq_score = 0
+    for cell in line:
+        if cell == player:
+            count += 1
+        elif cell == EMPTY:
+            empty += 1
+        else:
+            if count == 3 and empty >= 1:
+                seq_score += threat
+            elif 0 < count < 4 and empty >= (4 - count):
+                seq_score += SEQUENCE_WEIGHTS[count]
+            count = 0
+            empty = 0
+    if count == 3 and empty >= 1:
+        seq_score += threat
+    elif 0 < count < 4 and empty >= (4 - count):
+        seq_score += SEQUENCE_WEIGHTS[count]
+    return seq_score
+
+def sample_line(ai_count, hu_count):
+    """Return a 4-cell line holding the given numbers of AI and human pieces."""
+    return [AI_PLAYER] * ai_count + [HUMAN_PLAYER] * hu_count + [EMPTY] * (4 - ai_count - hu_count)
+
+# Score of a 4-cell window, indexed by 5 * (AI pieces) + (human pieces) in it.
+# The score only depends on these counts, not on where the pieces are.
+LINE_SCORE = [count_sequence(sample_line(ai, hu), AI_PLAYER)
+              - count_sequence(sample_line(ai, hu), HUMAN_PLAYER)
+              if ai + hu <= 4 else 0
+              for ai in range(5) for hu in range(5)]
 
 def heuristic(board):
     """Heuristic evaluation for non-terminal states."""
     score = 0
-    weights = {3: 100, 2: 10, 1: 1}  # Weights for sequences
-
-    def count_sequence(line, player):
-        count = 0
-        empty = 0
-        seq_score = 0
-        for cell in line:
-            if cell == player:
-                count += 1
-            elif cell == EMPTY:
-                empty += 1
-            else:
-                if count == 3 and empty >= 1:
-                    seq_score += 1000 if player == AI_PLAYER else -1000
-                elif count in weights and empty >= (4 - count):
-                    seq_score += weights.get(count, 0)
-                count = 0
-                empty = 0
-        if count == 3 and empty >= 1:
-            seq_score += 1000 if player == AI_PLAYER else -1000
-        elif count in weights and empty >= (4 - count):
-            seq_score += weights.get(count, 0)
-        return seq_score
-
-    # Horizontal
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            line = [board[row][col + i] for i in range(4)]
-            score += count_sequence(line, AI_PLAYER)
-            score -= count_sequence(line, HUMAN_PLAYER)
-
-    # Vertical
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            line = [board[row + i][col] for i in range(4)]
-            score += count_sequence(line, AI_PLAYER)
-            score -= count_sequence(line, HUMAN_PLAYER)
-
-    # Diagonal (positive slope)
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            line = [board[row + i][col + i] for i in range(4)]
-            score += count_sequence(line, AI_PLAYER)
-            score -= count_sequence(line, HUMAN_PLAYER)
-
-    # Diagonal (negative slope)
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            line = [board[row - i][col + i] for i in range(4)]
-            score += count_sequence(line, AI_PLAYER)
-            score -= count_sequence(line, HUMAN_PLAYER)
+    ai_bits, hu_bits = board[0], board[1]
+    # All windows of the four directions in a single pass: two popcounts and one lookup each
+    for mask in WINDOW_MASKS:
+        score += LINE_SCORE[5 * (ai_bits & mask).bit_count() + (hu_bits & mask).bit_count()]
+    return score
 
+def canonical_key(board):
+    """Return (key, mirrored): the smaller of the two Zobrist keys and whether it is the mirror one."""
+    zkey, zkey_mirror = board[3], board[4]
+    if zkey_mirror < zkey:
+        return zkey_mirror, True
+    return zkey, False
+
+def cached_heuristic(board):
+    """Heuristic evaluation, memoized on the canonical key."""
+    key = min(board[3], board[4])
+    score = EVAL_CACHE.get(key)
+    if score is None:
+        score = heuristic(board)
+        EVAL_CACHE[key] = score
     return score
 
-def max_value(board, alpha, beta, depth):
-    """Maximize utility for AI."""
-    if Terminal_Test(board):
-        return Utility(board)
+def ordered_moves(board, tt_move, depth, player_idx):
+    """Prioritized moves, with the transposition table's best move tried first."""
+    if tt_move is not None and is_valid_move(board, tt_move):
+        yield tt_move
+    for col in prioritize_moves(board, KILLERS[depth], HISTORY[player_idx]):
+        if col != tt_move:
+            yield col
+
+def record_cutoff(col, depth, player_idx):
+    """Remember a move that caused a cutoff as a killer and in the history table."""
+    killers = KILLERS[depth]
+    if col != killers[0]:
+        KILLERS[depth] = [col, killers[0]]
+    HISTORY[player_idx][col] += depth * depth
+
+def max_value(board, alpha, beta, depth, deadline, allow_null=True,
+              last_move=None, extensions=MAX_EXTENSIONS):
+    """Maximize utility for AI.
+
+    last_move is the (row, col) just played; a horizon node where it made a
+    three-in-a-row threat is searched one more ply, at most extensions times per line.
+    """
+    if time.time() > deadline:
+        raise SearchTimeout
+    is_terminal, utility = terminal_utility(board, HUMAN_PLAYER)
+    if is_terminal:
+        return utility
     if depth == 0:
-        return heuristic(board)
-
-    v = float('-inf')
-    for col in prioritize_moves(board):  # Use prioritized move ordering
-        new_board, _ = drop_piece(board, col, AI_PLAYER)
-        v = max(v, min_value(new_board, alpha, beta, depth - 1))
+        if not (extensions and last_move is not None
+                and creates_three_threat(board, *last_move, HUMAN_PLAYER)):
+            return cached_heuristic(board)
+        depth, extensions = 1, extensions - 1  # Quiescence: resolve the threat first
+
+    key, mirrored = canonical_key(board)
+    entry = TT.get(key)
+    tt_move = None
+    if entry is not None:
+        tt_depth, tt_value, tt_flag, tt_move = entry
+        if mirrored and tt_move is not None:
+            tt_move = COLS - 1 - tt_move  # Stored for the mirror board
+        if tt_depth >= depth:
+            if tt_flag == EXACT:
+                return tt_value
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value
+
+    # Null move: let the human play twice; if AI still reaches beta, prune.
+    # Skipped when any threat exists, since zugzwang around threats makes passing misleading.
+    if allow_null and depth >= NULL_MOVE_MIN_DEPTH and beta < POS_INF and not has_threat(board):
+        if min_value(board, beta - 1, beta, depth - 1 - NULL_MOVE_R, deadline, False) >= beta:
+            return beta
+
+    alpha_orig = alpha
+    v = NEG_INF
+    best_move = None
+    for col in ordered_moves(board, tt_move, depth, 0):  # Use prioritized move ordering
+        row = make_move(board, col, AI_PLAYER)
+        value = min_value(board, alpha, beta, depth - 1, deadline,
+                          last_move=(row, col), extensions=extensions)
+        unmake_move(board, col, row)
+        if value > v:
+            v = value
+            best_move = col
         alpha = max(alpha, v)
         if v >= beta:
-            return v
+            record_cutoff(col, depth, 0)
+            break
+
+    flag = UPPER if v <= alpha_orig else LOWER if v >= beta else EXACT
+    if mirrored and best_move is not None:
+        best_move = COLS - 1 - best_move
+    TT[key] = (depth, v, flag, best_move)
     return v
 
-def min_value(board, alpha, beta, depth):
-    """Minimize utility for human."""
-    if Terminal_Test(board):
-        return Utility(board)
+def min_value(board, alpha, beta, depth, deadline, allow_null=True,
+              last_move=None, extensions=MAX_EXTENSIONS):
+    """Minimize utility for human (see max_value for last_move and extensions)."""
+    if time.time() > deadline:
+        raise SearchTimeout
+    is_terminal, utility = terminal_utility(board, AI_PLAYER)
+    if is_terminal:
+        return utility
     if depth == 0:
-        return heuristic(board)
+        if not (extensions and last_move is not None
+                and creates_three_threat(board, *last_move, AI_PLAYER)):
+            return cached_heuristic(board)
+        depth, extensions = 1, extensions - 1  # Quiescence: resolve the threat first
+
+    key, mirrored = canonical_key(board)
+    key ^= MIN_TURN_KEY
+    entry = TT.get(key)
+    tt_move = None
+    if entry is not None:
+        tt_depth, tt_value, tt_flag, tt_move = entry
+        if mirrored and tt_move is not None:
+            tt_move = COLS - 1 - tt_move  # Stored for the mirror board
+        if tt_depth >= depth:
+            if tt_flag == EXACT:
+                return tt_value
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value
 
-    v = float('inf')
-    for col in prioritize_moves(board):  # Use prioritized move ordering
-        new_board, _ = drop_piece(board, col, HUMAN_PLAYER)
-        v = min(v, max_value(new_board, alpha, beta, depth - 1))
+    # Null move: let AI play twice; if the human still holds alpha, prune (see max_value)
+    if allow_null and depth >= NULL_MOVE_MIN_DEPTH and alpha > NEG_INF and not has_threat(board):
+        if max_value(board, alpha, alpha + 1, depth - 1 - NULL_MOVE_R, deadline, False) <= alpha:
+            return alpha
+
+    beta_orig = beta
+    v = POS_INF
+    best_move = None
+    for col in ordered_moves(board, tt_move, depth, 1):  # Use prioritized move ordering
+        row = make_move(board, col, HUMAN_PLAYER)
+        value = max_value(board, alpha, beta, depth - 1, deadline,
+                          last_move=(row, col), extensions=extensions)
+        unmake_move(board, col, row)
+        if value < v:
+            v = value
+            best_move = col
         beta = min(beta, v)
         if v <= alpha:
-            return v
+            record_cutoff(col, depth, 1)
+            break
+
+    flag = LOWER if v >= beta_orig else UPPER if v <= alpha else EXACT
+    if mirrored and best_move is not None:
+        best_move = COLS - 1 - best_move
+    TT[key] = (depth, v, flag, best_move)
     return v
 
-def IA_Decision(board):
-    """Decide the best column for the AI."""
-    start_time = time.time()
-    best_value = float('-inf')
-    best_move = None
-    moves = prioritize_moves(board)  # Prioritize winning/blocking moves
+def search_child(board, col, depth, alpha, beta, deadline):
+    """Value of the AI playing col on board, searched to the given root depth (pool worker)."""
+    row = make_move(board, col, AI_PLAYER)
+    return min_value(board, alpha, beta, depth - 1, deadline, last_move=(row, col))
+
+def search_root(board, depth, pv_move, deadline, alpha=NEG_INF, beta=POS_INF, pool=None):
+    """Search the root to the given depth, trying pv_move first; return (best_move, best_value).
 
+    A best_value outside (alpha, beta) is only a bound and calls for a re-search.
+    With a pool, the first move is searched here and the remaining ones are then
+    searched in parallel against its score (Young Brothers Wait).
+    """
+    best_value = NEG_INF
+    best_move = None
+    moves = ordered_moves(board, pv_move, depth, 0)
+    younger = ()
+    if pool is not None and depth >= PARALLEL_MIN_DEPTH:
+        moves = list(moves)
+        moves, younger = moves[:1], moves[1:]
     for col in moves:
-        new_board, _ = drop_piece(board, col, AI_PLAYER)
-        value = min_value(new_board, float('-inf'), float('inf'), MAX_DEPTH - 1)
+        row = make_move(board, col, AI_PLAYER)
+        value = min_value(board, max(alpha, best_value), beta, depth - 1, deadline,
+                          last_move=(row, col))
+        unmake_move(board, col, row)
         if value > best_value:
             best_value = value
             best_move = col
-        if time.time() - start_time > 9:
-            break
+        if best_value >= beta:
+            return best_move, best_value
+
+    if younger:
+        # Workers keep their own TT; a SearchTimeout raised in one of them is re-raised here
+        window = max(alpha, best_value)
+        tasks = [(board, col, depth, window, beta, deadline) for col in younger]
+        for col, value in zip(younger, pool.starmap(search_child, tasks, chunksize=1)):
+            if value > best_value:
+                best_value = value
+                best_move = col
+    return best_move, best_value
+
+def IA_Decision(board):
+    """Decide the best column for the AI using iterative deepening."""
+    deadline = time.time() + MAX_TIME
+    if len(TT) > TT_MAX_SIZE:
+        TT.clear()
+    if len(EVAL_CACHE) > TT_MAX_SIZE:
+        EVAL_CACHE.clear()
+    KILLERS[:] = [[None, None] for _ in range(MAX_DEPTH_CAP + 1)]
+    # Search on a copy: a timeout unwinds the recursion without unmaking moves
+    search_board = [board[0], board[1], board[2][:], board[3], board[4]]
+    empty_cells = ROWS * COLS - sum(board[2])
+    best_move = None
+    best_value = None
+    # Created on the first iteration deep enough to use it, then shared by the later ones:
+    # workers keep their tables across iterations
+    pool = None
+
+    try:
+        for depth in range(1, MAX_DEPTH_CAP + 1):
+            if pool is None and ROOT_WORKERS > 1 and depth >= PARALLEL_MIN_DEPTH:
+                pool = POOL_CONTEXT.Pool(ROOT_WORKERS)
+            try:
+                if best_value is None:
+                    move, value = search_root(search_board, depth, best_move, deadline, pool=pool)
+                else:
+                    # Aspiration window around the previous score, full window on fail-low/high
+                    alpha = best_value - ASPIRATION_WINDOW
+                    beta = best_value + ASPIRATION_WINDOW
+                    move, value = search_root(search_board, depth, best_move, deadline,
+                                              alpha, beta, pool)
+                    if value <= alpha or value >= beta:
+                        move, value = search_root(search_board, depth, best_move, deadline,
+                                                  pool=pool)
+            except SearchTimeout:
+                break  # Keep the move from the last completed iteration
+            best_move = move
+            best_value = value
+            if depth >= empty_cells:
+                break  # The whole game tree has been searched
+    finally:
+        if pool is not None:
+            pool.terminate()  # Also stops workers still finishing a timed-out iteration
 
     return best_move if best_move is not None else random.choice(get_valid_moves(board))
 
 def print_board(board):
     """Print the game board in a readable format."""
     print("\n  0  1  2  3  4  5  6  7  8  9 10 11")
-    for row in range(ROWS):
+    for row in board_to_grid(board):
         row_str = "|"
-        for col in range(COLS):
-            if board[row][col] == AI_PLAYER:
+        for cell in row:
+            if cell == AI_PLAYER:
                 row_str += " O "
-            elif board[row][col] == HUMAN_PLAYER:
+            elif cell == HUMAN_PLAYER:
                 row_str += " X "
             else:
                 row_str += " . "
@@ -227,7 +537,7 @@ def print_board(board):
 
 def play_game():
     """Main game loop for human vs AI."""
-    board = [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    board = create_board()
     
     while True:
         choice = input("Who starts? (1 for Human, 2 for AI): ").strip()
@@ -245,7 +555,7 @@ def play_game():
                 try:
                     col = int(input("Your move (column 0-11): ").strip())
                     if is_valid_move(board, col):
-                        board, _ = drop_piece(board, col, HUMAN_PLAYER)
+                        make_move(board, col, HUMAN_PLAYER)
                         print(f"Human played in column {col}")
                         break
                     else:
@@ -254,14 +564,14 @@ def play_game():
                     print("Please enter a number between 0 and 11.")
         else:
             col = IA_Decision(board)
-            board, _ = drop_piece(board, col, AI_PLAYER)
+            make_move(board, col, AI_PLAYER)
             print(f"AI played in column {col}")
 
-        if check_win(board, HUMAN_PLAYER):
+        if check_win(board[1]):
             print_board(board)
             print("Human wins!")
             return
-        elif check_win(board, AI_PLAYER):
+        elif check_win(board[0]):
             print_board(board)
             print("AI wins!")
             return
@@ -274,11 +584,10 @@ def play_game():
 
 def test_blocking_threat():
     """Test if AI blocks a human's three-in-a-row threat."""
-    board = [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    board = create_board()
     # Set up human's three-in-a-row at the bottom (e.g., columns 0, 1, 2)
-    board[5][0] = HUMAN_PLAYER
-    board[5][1] = HUMAN_PLAYER
-    board[5][2] = HUMAN_PLAYER
+    for col in range(3):
+        make_move(board, col, HUMAN_PLAYER)
     # Column 3 is empty, so AI should play there to block
     print("Test board (human has three in a row at bottom 0-2):")
     print_board(board)
@@ -1,6 +1,5 @@
 import random
 import time
-import copy
 
 # Constants
 ROWS = 6
@@ -8,163 +7,364 @@ COLS = 12
 AI_PLAYER = 1  # IA (rouge)
 HUMAN_PLAYER = -1  # Humain ou adversaire IA (jaune)
 EMPTY = 0
+# Bornes entières pour alpha-beta (comparaisons plus rapides que les infinis flottants)
+NEG_INF = -10**9
+POS_INF = 10**9
 MAX_TIME = 9  # 9-second limit (leaving 1 sec for overhead)
-BASE_DEPTH = 3  # Reduced base depth for faster response
+MAX_DEPTH_CAP = ROWS * COLS  # L'approfondissement itératif ne dépasse jamais le nombre de cases
+ASPIRATION_WINDOW = 50  # Demi-largeur de la fenêtre autour du score de l'itération précédente
+NULL_MOVE_R = 2  # Réduction de profondeur de la recherche du coup nul
+NULL_MOVE_MIN_DEPTH = 3  # Profondeur minimale pour tenter le coup nul
 DEBUG = False  # Activer le débogage pour analyse
 MAX_PIONS = 42  # 42 pions au total
+TT_MAX_SIZE = 1 << 20  # Nombre d'entrées avant de vider la table de transposition
+
+# Représentation bitboard : un entier par joueur, la case (row, col) est le bit col*7 + (5-row).
+# Chaque colonne occupe 7 bits (6 lignes + 1 sentinelle) pour que les décalages ne débordent pas.
+# Un plateau est la liste [ai_bits, hu_bits, heights, zkey, zkey_mirror], modifiée sur place,
+# zkey_mirror étant la clé de Zobrist du plateau aux colonnes inversées.
+H1 = ROWS + 1
+
+# Colonnes triées du centre vers les bords
+COL_ORDER = sorted(range(COLS), key=lambda c: abs(c - (COLS - 1) / 2))
+
+# Masques : case du bas de chaque colonne, toutes les cases jouables
+BOTTOM_MASK = sum(1 << (col * H1) for col in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# Bit de chaque case, indexé par row * COLS + col
+CELL_BITS = [1 << (col * H1 + (ROWS - 1 - row)) for row in range(ROWS) for col in range(COLS)]
+
+# Toutes les fenêtres de 4 cases des quatre directions, en indices dans CELL_BITS
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (-1, 1))  # horizontale, verticale, diagonales
+WINDOWS = [tuple((row + i * dr) * COLS + col + i * dc for i in range(4))
+           for dr, dc in DIRECTIONS
+           for row in range(ROWS) for col in range(COLS)
+           if 0 <= row + 3 * dr < ROWS and col + 3 * dc < COLS]
+WINDOW_MASKS = [sum(CELL_BITS[i] for i in window) for window in WINDOWS]
+
+# Clés de Zobrist, indexées par [row][col][joueur] (0 pour l'IA, 1 pour l'humain)
+ZOB = [[[random.getrandbits(64) for _ in range(2)] for _ in range(COLS)] for _ in range(ROWS)]
+# Clés de la case miroir : un plateau et son symétrique gauche-droite échangent zkey et zkey_mirror
+ZOB_MIRROR = [[ZOB[row][COLS - 1 - col] for col in range(COLS)] for row in range(ROWS)]
+MIN_TURN_KEY = random.getrandbits(64)  # Distingue les noeuds min des noeuds max
+
+# Table de transposition : clé canonique -> (depth, value, flag, best_move).
+# Un plateau et son miroir partagent l'entrée min(zkey, zkey_mirror), best_move dans ce sens.
+EXACT, LOWER, UPPER = 0, 1, 2
+TT = {}
+EVAL_CACHE = {}  # clé canonique -> evaluate_position (symétrique)
+
+# Ordre appris des coupures : deux coups killer par profondeur, historique par [joueur][col]
+KILLERS = [[None, None] for _ in range(MAX_DEPTH_CAP + 1)]
+HISTORY = [[0] * COLS, [0] * COLS]
 
 # Fonctions de base
+def create_board():
+    return [0, 0, [0] * COLS, 0, 0]
+
+def player_bits(board, player):
+    return board[0] if player == AI_PLAYER else board[1]
+
+def flat_cells(board):
+    ai_bits, hu_bits = board[0], board[1]
+    return [AI_PLAYER if ai_bits & bit else HUMAN_PLAYER if hu_bits & bit else EMPTY
+            for bit in CELL_BITS]
+
+def board_to_grid(board):
+    cells = flat_cells(board)
+    return [cells[row * COLS:(row + 1) * COLS] for row in range(ROWS)]
+
 def is_valid_move(board, col):
-    return 0 <= col < COLS and board[0][col] == EMPTY
+    return 0 <= col < COLS and board[2][col] < ROWS
 
 def get_valid_moves(board):
-    return [col for col in range(COLS) if is_valid_move(board, col)]
+    heights = board[2]
+    return [col for col in range(COLS) if heights[col] < ROWS]
 
-def drop_piece(board, col, player):
-    new_board = copy.deepcopy(board)
-    for row in range(ROWS - 1, -1, -1):
-        if new_board[row][col] == EMPTY:
-            new_board[row][col] = player
-            return new_board, row
-    return new_board, -1
+def make_move(board, col, player):
+    heights = board[2]
+    height = heights[col]
+    if height >= ROWS:
+        return -1
+    row = ROWS - 1 - height
+    if player == AI_PLAYER:
+        board[0] |= 1 << (col * H1 + height)
+        board[3] ^= ZOB[row][col][0]
+        board[4] ^= ZOB_MIRROR[row][col][0]
+    else:
+        board[1] |= 1 << (col * H1 + height)
+        board[3] ^= ZOB[row][col][1]
+        board[4] ^= ZOB_MIRROR[row][col][1]
+    heights[col] = height + 1
+    return row
 
-def check_win(board, player):
+def unmake_move(board, col, row):
+    bit = 1 << (col * H1 + (ROWS - 1 - row))
+    if board[0] & bit:
+        board[0] ^= bit
+        board[3] ^= ZOB[row][col][0]
+        board[4] ^= ZOB_MIRROR[row][col][0]
+    else:
+        board[1] ^= bit
+        board[3] ^= ZOB[row][col][1]
+        board[4] ^= ZOB_MIRROR[row][col][1]
+    board[2][col] -= 1
+
+def check_win(bits):
     # Vérification horizontale
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            if all(board[row][col + i] == player for i in range(4)):
-                return True
+    m = bits & (bits >> H1)
+    if m & (m >> (2 * H1)):
+        return True
     # Vérification verticale
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            if all(board[row + i][col] == player for i in range(4)):
-                return True
+    m = bits & (bits >> 1)
+    if m & (m >> 2):
+        return True
     # Diagonale montante
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if all(board[row + i][col + i] == player for i in range(4)):
-                return True
+    m = bits & (bits >> (H1 + 1))
+    if m & (m >> (2 * (H1 + 1))):
+        return True
     # Diagonale descendante
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if all(board[row - i][col + i] == player for i in range(4)):
-                return True
+    m = bits & (bits >> (H1 - 1))
+    if m & (m >> (2 * (H1 - 1))):
+        return True
     return False
 
+def winning_cells(bits, occupied):
+    # Cases vides qui compléteraient un alignement de quatre pour bits
+    cells = (bits << 1) & (bits << 2) & (bits << 3)
+    for shift in (H1, H1 - 1, H1 + 1):
+        pair = (bits << shift) & (bits << (2 * shift))
+        cells |= pair & (bits << (3 * shift))
+        cells |= pair & (bits >> shift)
+        pair = (bits >> shift) & (bits >> (2 * shift))
+        cells |= pair & (bits << shift)
+        cells |= pair & (bits >> (3 * shift))
+    return cells & (BOARD_MASK ^ occupied)
+
+def has_threat(board):
+    # Une menace, jouable ou non, pour l'un des deux joueurs
+    ai_bits, hu_bits = board[0], board[1]
+    occupied = ai_bits | hu_bits
+    return bool(winning_cells(ai_bits, occupied) or winning_cells(hu_bits, occupied))
+
 def is_board_full(board):
-    return all(board[0][col] != EMPTY for col in range(COLS))
+    return (board[0] | board[1]) == BOARD_MASK
+
+def ordered_valid_moves(board, first_move, killers=(), history=None):
+    heights = board[2]
+    moves = [col for col in COL_ORDER if heights[col] < ROWS]
+    # Coups ayant provoqué des coupures : historique, puis killers
+    if history is not None:
+        moves.sort(key=history.__getitem__, reverse=True)  # tri stable : le centre départage
+    for col in reversed(killers):
+        if col in moves:
+            moves.remove(col)
+            moves.insert(0, col)
+    # Le coup donné (meilleur coup connu) est essayé en premier
+    if first_move is not None and first_move in moves:
+        moves.remove(first_move)
+        moves.insert(0, first_move)
+    return moves
+
+def record_cutoff(col, depth, player_idx):
+    killers = KILLERS[depth]
+    if col != killers[0]:
+        KILLERS[depth] = [col, killers[0]]
+    HISTORY[player_idx][col] += depth * depth
 
 def Terminal_Test(board):
-    return check_win(board, AI_PLAYER) or check_win(board, HUMAN_PLAYER) or is_board_full(board)
+    return check_win(board[0]) or check_win(board[1]) or is_board_full(board)
+
+def game_over_after(board, last_player):
+    # Seul le joueur qui vient de jouer peut avoir aligné quatre pions
+    return check_win(player_bits(board, last_player)) or is_board_full(board)
 
 # Fonctions d'évaluation et heuristiques
-def evaluate_position(board):
-    score = 0
-    # Bonus pour les configurations de l'IA
-    score += evaluate_lines(board, AI_PLAYER)
-    # Pénalités pour les configurations de l'humain
-    score -= evaluate_lines(board, HUMAN_PLAYER)
+def cached_evaluate_position(board):
+    key = min(board[3], board[4])
+    score = EVAL_CACHE.get(key)
+    if score is None:
+        score = evaluate_position(board)
+        EVAL_CACHE[key] = score
     return score
 
-def evaluate_lines(board, player):
+def evaluate_position(board):
     score = 0
-    # Évaluation horizontale
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            line = [board[row][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
-    # Évaluation verticale
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            line = [board[row + i][col] for i in range(4)]
-            score += evaluate_line(line, player)
-    # Évaluation diagonale montante
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            line = [board[row + i][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
-    # Évaluation diagonale descendante
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            line = [board[row - i][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
+    ai_bits, hu_bits = board[0], board[1]
+    # Une seule passe sur les fenêtres : deux popcounts et une lecture de table chacune
+    for mask in WINDOW_MASKS:
+        score += LINE_SCORE[5 * (ai_bits & mask).bit_count() + (hu_bits & mask).bit_count()]
     return score
 
 def evaluate_line(line, player):
-    opponent = -player
-    if line.count(opponent) > 0 and line.count(player) > 0:
+    # Chaque compte n'est fait qu'une fois ; les cases vides s'en déduisent
+    own = line.count(player)
+    opp = line.count(-player)
+    if own and opp:
         return 0  # ligne bloquée
+    empty = len(line) - own - opp
 
-    if line.count(player) == 4:
+    if own == 4:
         return 1000  # victoire immédiate
-    elif line.count(player) == 3 and line.count(EMPTY) == 1:
+    elif own == 3 and empty == 1:
         return 50  # menace forte
-    elif line.count(player) == 2 and line.count(EMPTY) == 2:
+    elif own == 2 and empty == 2:
         return 10  # potentiel
-    elif line.count(player) == 1 and line.count(EMPTY) == 3:
+    elif own == 1 and empty == 3:
         return 1  # faible potentiel
     else:
         return 0
 
+def sample_line(ai_count, hu_count):
+    return [AI_PLAYER] * ai_count + [HUMAN_PLAYER] * hu_count + [EMPTY] * (4 - ai_count - hu_count)
+
+# Score d'une fenêtre de 4 cases (bonus IA moins pénalité humain), indexé par
+# 5 * (pions IA) + (pions humains) : evaluate_line ne dépend que de ces nombres
+LINE_SCORE = [evaluate_line(sample_line(ai, hu), AI_PLAYER)
+              - evaluate_line(sample_line(ai, hu), HUMAN_PLAYER)
+              if ai + hu <= 4 else 0
+              for ai in range(5) for hu in range(5)]
+
 # Algorithme Minimax avec élagage Alpha-Beta
-def minimax_ab(board, depth, alpha, beta, maximizing_player, start_time):
-    if time.time() - start_time > MAX_TIME or depth == 0 or Terminal_Test(board):
-        return evaluate_position(board)
+def minimax_ab(board, depth, alpha, beta, maximizing_player, start_time, allow_null=True):
+    last_player = HUMAN_PLAYER if maximizing_player else AI_PLAYER
+    if time.time() - start_time > MAX_TIME or depth == 0 or game_over_after(board, last_player):
+        return cached_evaluate_position(board)
+
+    # Consultation de la table de transposition
+    # Un plateau et son miroir ont la même valeur : on garde la plus petite des deux clés
+    zkey, zkey_mirror = board[3], board[4]
+    mirrored = zkey_mirror < zkey
+    key = zkey_mirror if mirrored else zkey
+    if not maximizing_player:
+        key ^= MIN_TURN_KEY
+    entry = TT.get(key)
+    tt_move = None
+    if entry is not None:
+        tt_depth, tt_value, tt_flag, tt_move = entry
+        if mirrored and tt_move is not None:
+            tt_move = COLS - 1 - tt_move  # stocké pour le plateau miroir
+        if tt_depth >= depth:
+            if tt_flag == EXACT:
+                return tt_value
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value
+    # Coup nul : l'adversaire joue deux fois ; s'il ne renverse pas la borne, on élague.
+    # Évité en présence de menaces, où le zugzwang rend le coup nul trompeur.
+    if allow_null and depth >= NULL_MOVE_MIN_DEPTH and not has_threat(board):
+        if maximizing_player:
+            if beta < POS_INF and minimax_ab(board, depth - 1 - NULL_MOVE_R, beta - 1, beta,
+                                             False, start_time, False) >= beta:
+                return beta
+        elif alpha > NEG_INF and minimax_ab(board, depth - 1 - NULL_MOVE_R, alpha, alpha + 1,
+                                            True, start_time, False) <= alpha:
+            return alpha
+    alpha_orig, beta_orig = alpha, beta
 
-    valid_moves = get_valid_moves(board)
+    player_idx = 0 if maximizing_player else 1
+    valid_moves = ordered_valid_moves(board, tt_move, KILLERS[depth], HISTORY[player_idx])
 
+    best_move = None
     if maximizing_player:
-        value = float('-inf')
+        value = NEG_INF
         for col in valid_moves:
-            new_board, _ = drop_piece(board, col, AI_PLAYER)
-            value = max(value, minimax_ab(new_board, depth - 1, alpha, beta, False, start_time))
+            row = make_move(board, col, AI_PLAYER)
+            score = minimax_ab(board, depth - 1, alpha, beta, False, start_time)
+            unmake_move(board, col, row)
+            if score > value:
+                value = score
+                best_move = col
             alpha = max(alpha, value)
             if alpha >= beta:
+                record_cutoff(col, depth, player_idx)
                 break  # élagage beta
-        return value
     else:
-        value = float('inf')
+        value = POS_INF
         for col in valid_moves:
-            new_board, _ = drop_piece(board, col, HUMAN_PLAYER)
-            value = min(value, minimax_ab(new_board, depth - 1, alpha, beta, True, start_time))
+            row = make_move(board, col, HUMAN_PLAYER)
+            score = minimax_ab(board, depth - 1, alpha, beta, True, start_time)
+            unmake_move(board, col, row)
+            if score < value:
+                value = score
+                best_move = col
             beta = min(beta, value)
             if alpha >= beta:
+                record_cutoff(col, depth, player_idx)
                 break  # élagage alpha
-        return value
 
-def IA_Decision(board):
-    start_time = time.time()
-    valid_moves = get_valid_moves(board)
-    best_move = random.choice(valid_moves)  # initialisation aléatoire
-    best_score = float('-inf')
+    # Un résultat obtenu après le temps limite n'est pas fiable : on ne le stocke pas
+    if time.time() - start_time <= MAX_TIME:
+        flag = UPPER if value <= alpha_orig else LOWER if value >= beta_orig else EXACT
+        if mirrored and best_move is not None:
+            best_move = COLS - 1 - best_move
+        TT[key] = (depth, value, flag, best_move)
+    return value
 
-    # Itérer sur les coups possibles et évaluer
+def search_root(board, depth, pv_move, start_time, alpha=NEG_INF, beta=POS_INF):
+    valid_moves = ordered_valid_moves(board, pv_move)
+
+    # Un score hors de ]alpha, beta[ n'est qu'une borne
+    best_move = None
+    best_score = NEG_INF
     for col in valid_moves:
-        new_board, _ = drop_piece(board, col, AI_PLAYER)
-        score = minimax_ab(new_board, BASE_DEPTH, float('-inf'), float('inf'), False, start_time)
-        
+        row = make_move(board, col, AI_PLAYER)
+        score = minimax_ab(board, depth - 1, max(alpha, best_score), beta, False, start_time)
+        unmake_move(board, col, row)
         if score > best_score:
             best_score = score
             best_move = col
-        
-        # Vérifier la contrainte de temps après chaque coup évalué
+        if best_score >= beta:
+            break
+    return best_move, best_score
+
+def IA_Decision(board):
+    start_time = time.time()
+    if len(TT) > TT_MAX_SIZE:
+        TT.clear()
+    if len(EVAL_CACHE) > TT_MAX_SIZE:
+        EVAL_CACHE.clear()
+    KILLERS[:] = [[None, None] for _ in range(MAX_DEPTH_CAP + 1)]
+    best_move = random.choice(get_valid_moves(board))  # initialisation aléatoire
+    best_score = None
+    empty_cells = ROWS * COLS - sum(board[2])
+
+    # Approfondissement itératif : chaque profondeur ordonne la suivante
+    for depth in range(1, MAX_DEPTH_CAP + 1):
+        if best_score is None:
+            move, score = search_root(board, depth, best_move, start_time)
+        else:
+            # Fenêtre d'aspiration autour du score précédent, élargie en cas d'échec
+            alpha = best_score - ASPIRATION_WINDOW
+            beta = best_score + ASPIRATION_WINDOW
+            move, score = search_root(board, depth, best_move, start_time, alpha, beta)
+            if score <= alpha or score >= beta:
+                move, score = search_root(board, depth, best_move, start_time)
+        # Une itération interrompue par le temps limite n'est pas fiable
         if time.time() - start_time > MAX_TIME:
-            print("Temps limite dépassé pendant la décision de l'IA")
+            if DEBUG:
+                print(f"Temps limite atteint, profondeur complète : {depth - 1}")
             break
-    
-    # En cas de temps restant, augmenter la profondeur (optionnel)
-    
+        best_move = move
+        best_score = score
+        if depth >= empty_cells:
+            break  # tout l'arbre de jeu a été exploré
+
     return best_move
 
 # Fonctions d'affichage et de jeu
 def print_board(board):
     print("\n  " + "  ".join(str(i) for i in range(COLS)))
-    for row in board:
+    for row in board_to_grid(board):
         print("| " + "  ".join('X' if cell == AI_PLAYER else 'O' if cell == HUMAN_PLAYER else '.' for cell in row) + " |")
     print("-" * (COLS*3 + 1))
 
 def play_game():
-    board = [[EMPTY]*COLS for _ in range(ROWS)]
+    board = create_board()
     current_player = HUMAN_PLAYER if int(input("Qui commence? (1 pour Humain, 2 pour IA): ")) == 1 else AI_PLAYER
     
     while not Terminal_Test(board):
@@ -180,13 +380,13 @@ def play_game():
             col = IA_Decision(board)
             print(f"L'IA a joué dans la colonne {col}")
         
-        board, _ = drop_piece(board, col, current_player)
+        make_move(board, col, current_player)
         current_player = AI_PLAYER if current_player == HUMAN_PLAYER else HUMAN_PLAYER
     
     print_board(board)
-    if check_win(board, AI_PLAYER):
+    if check_win(board[0]):
         print("L'IA gagne!")
-    elif check_win(board, HUMAN_PLAYER):
+    elif check_win(board[1]):
         print("L'Humain gagne!")
     else:
         print("Match nul!")
@@ -1,104 +1,116 @@
 import random
 import time
-import copy
 
 ROWS = 6
 COLS = 12
 IA = 1
-ADVERSAIRE = -1
+ADVERSAIRE = 2
 EMPTY = 0
+# Bornes entières pour alpha-beta (comparaisons plus rapides que les infinis flottants)
+NEG_INF = -10**9
+POS_INF = 10**9
 MAX_TIME = 9  # 9 secondes pour éviter de dépasser la limite
 BASE_DEPTH = 3
 MAX_PIONS = 42
 
+# Plateau : bytearray de ROWS * COLS octets, case (row, col) à l'indice row * COLS + col (row 0 en haut)
+# Valeurs non signées : EMPTY = 0, IA = 1, ADVERSAIRE = 2, et l'adversaire de p est 3 - p
+
+# Encodage SWAR : 3 bits par case (001 = IA, 010 = vide, 100 = adversaire), une ligne par entier
+ENC = (0b010, 0b001, 0b100)  # indexé par la valeur de la case
+# Bit du joueur dans chaque champ : toutes les colonnes, ou celles où une fenêtre de 4 peut commencer
+LANES = {p: sum(ENC[p] << (3 * col) for col in range(COLS)) for p in (IA, ADVERSAIRE)}
+START_LANES = {p: sum(ENC[p] << (3 * col) for col in range(COLS - 3)) for p in (IA, ADVERSAIRE)}
+
 def is_valid_move(board, col):
-    return 0 <= col < COLS and board[0][col] == EMPTY
+    return 0 <= col < COLS and board[col] == EMPTY
 
 def get_valid_moves(board):
     return [col for col in range(COLS) if is_valid_move(board, col)]
 
 def drop_piece(board, col, player):
-    new_board = copy.deepcopy(board)
+    new_board = bytearray(board)
     for row in range(ROWS - 1, -1, -1):
-        if new_board[row][col] == EMPTY:
-            new_board[row][col] = player
+        if new_board[row * COLS + col] == EMPTY:
+            new_board[row * COLS + col] = player
             return new_board, row
     return new_board, -1
 
+def pack_row(board, row):
+    packed = 0
+    for col, cell in enumerate(board[row * COLS:(row + 1) * COLS]):
+        packed |= ENC[cell] << (3 * col)
+    return packed
+
 def check_win(board, player):
-    # Horizontale
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            if all(board[row][col + i] == player for i in range(4)):
-                return True
-    # Verticale
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            if all(board[row + i][col] == player for i in range(4)):
-                return True
+    rows = [pack_row(board, row) for row in range(ROWS)]
+    lanes = START_LANES[player]
+    # Horizontale : quatre champs consécutifs d'une même ligne
+    for r in rows:
+        if r & (r >> 3) & (r >> 6) & (r >> 9) & lanes:
+            return True
+    # Verticale : le même champ sur quatre lignes consécutives
+    for row in range(ROWS - 3):
+        if rows[row] & rows[row + 1] & rows[row + 2] & rows[row + 3] & LANES[player]:
+            return True
     # Diagonale montante
     for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if all(board[row + i][col + i] == player for i in range(4)):
-                return True
+        if rows[row] & (rows[row + 1] >> 3) & (rows[row + 2] >> 6) & (rows[row + 3] >> 9) & lanes:
+            return True
     # Diagonale descendante
     for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if all(board[row - i][col + i] == player for i in range(4)):
-                return True
+        if rows[row] & (rows[row - 1] >> 3) & (rows[row - 2] >> 6) & (rows[row - 3] >> 9) & lanes:
+            return True
     return False
 
 def is_board_full(board):
-    count = 0
-    for col in range(COLS):
-        for row in range(ROWS):
-            if board[row][col] != EMPTY:
-                count += 1
-            if count == MAX_PIONS:
-                return True
-    return False
+    return len(board) - board.count(EMPTY) >= MAX_PIONS
 
 def Terminal_Test(board):
     return check_win(board, IA) or check_win(board, ADVERSAIRE) or is_board_full(board)
 
 def evaluate_line(line, player):
-    opponent = -player
-    if line.count(opponent) > 0 and line.count(player) > 0:
+    # Chaque compte n'est fait qu'une fois ; les cases vides s'en déduisent
+    own = line.count(player)
+    opp = line.count(3 - player)
+    if own and opp:
         return 0  # ligne bloquée
+    empty = len(line) - own - opp
 
-    if line.count(player) == 4:
+    if own == 4:
         return 100000  # victoire immédiate
-    elif line.count(player) == 3 and line.count(EMPTY) == 1:
+    elif own == 3 and empty == 1:
         return 100  # menace forte
-    elif line.count(player) == 2 and line.count(EMPTY) == 2:
+    elif own == 2 and empty == 2:
         return 10  # potentiel
-    elif line.count(player) == 1 and line.count(EMPTY) == 3:
+    elif own == 1 and empty == 3:
         return 1  # faible potentiel
     else:
         return 0
 
 def evaluate_lines(board, player):
     score = 0
+    # Chaque fenêtre est une tranche du plateau : pas de 1, COLS, COLS + 1 ou COLS - 1
     # Horizontale
     for row in range(ROWS):
         for col in range(COLS - 3):
-            line = [board[row][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
+            start = row * COLS + col
+            score += evaluate_line(board[start:start + 4], player)
     # Verticale
     for col in range(COLS):
         for row in range(ROWS - 3):
-            line = [board[row + i][col] for i in range(4)]
-            score += evaluate_line(line, player)
+            start = row * COLS + col
+            score += evaluate_line(board[start:start + 3 * COLS + 1:COLS], player)
     # Diagonale montante
     for row in range(ROWS - 3):
         for col in range(COLS - 3):
-            line = [board[row + i][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
+            start = row * COLS + col
+            score += evaluate_line(board[start:start + 3 * (COLS + 1) + 1:COLS + 1], player)
     # Diagonale descendante
     for row in range(3, ROWS):
         for col in range(COLS - 3):
-            line = [board[row - i][col + i] for i in range(4)]
-            score += evaluate_line(line, player)
+            start = (row - 3) * COLS + col + 3  # parcourue depuis sa case du haut
+            score += evaluate_line(board[start:start + 3 * (COLS - 1) + 1:COLS - 1], player)
     return score
 
 def evaluate_position(board):
@@ -109,7 +121,7 @@ def evaluate_position(board):
     # Bonus pour le centre
     center_col = COLS // 2
     for row in range(ROWS):
-        if board[row][center_col] == IA:
+        if board[row * COLS + center_col] == IA:
             score += 3
     return score
 
@@ -118,7 +130,7 @@ def minimax_ab(board, depth, alpha, beta, maximizing_player, start_time):
         return evaluate_position(board)
     valid_moves = get_valid_moves(board)
     if maximizing_player:
-        value = float('-inf')
+        value = NEG_INF
         for col in valid_moves:
             new_board, _ = drop_piece(board, col, IA)
             # Coup gagnant immédiat
@@ -130,7 +142,7 @@ def minimax_ab(board, depth, alpha, beta, maximizing_player, start_time):
                 break
         return value
     else:
-        value = float('inf')
+        value = POS_INF
         for col in valid_moves:
             new_board, _ = drop_piece(board, col, ADVERSAIRE)
             # Coup gagnant immédiat pour l'adversaire
@@ -146,7 +158,7 @@ def IA_Decision(board):
     start_time = time.time()
     valid_moves = get_valid_moves(board)
     best_move = random.choice(valid_moves)
-    best_score = float('-inf')
+    best_score = NEG_INF
 
     # Priorité : coup gagnant immédiat
     for col in valid_moves:
@@ -162,7 +174,7 @@ def IA_Decision(board):
     # Sinon, évalue les coups
     for col in valid_moves:
         new_board, _ = drop_piece(board, col, IA)
-        score = minimax_ab(new_board, BASE_DEPTH, float('-inf'), float('inf'), False, start_time)
+        score = minimax_ab(new_board, BASE_DEPTH, NEG_INF, POS_INF, False, start_time)
         if score > best_score:
             best_score = score
             best_move = col
@@ -172,12 +184,13 @@ def IA_Decision(board):
 
 def print_board(board):
     print("\n  " + "  ".join(str(i) for i in range(COLS)))
-    for row in board:
-        print("| " + "  ".join('X' if cell == IA else 'O' if cell == ADVERSAIRE else '.' for cell in row) + " |")
+    for row in range(ROWS):
+        cells = board[row * COLS:(row + 1) * COLS]
+        print("| " + "  ".join('X' if cell == IA else 'O' if cell == ADVERSAIRE else '.' for cell in cells) + " |")
     print("-" * (COLS*3 + 1))
 
 def play_game():
-    board = [[EMPTY]*COLS for _ in range(ROWS)]
+    board = bytearray(ROWS * COLS)
     current_player = ADVERSAIRE if int(input("Qui commence? (1 pour Humain, 2 pour IA): ")) == 1 else IA
 
     while not Terminal_Test(board):